@@ -1,18 +1,74 @@
 import os
 import sys
 import json
-import feedparser
 import datetime
-import anthropic
+import calendar
 from dotenv import load_dotenv
-from dateutil import parser
-import time
-from typing import List, Dict, Any, Optional, Tuple
+from typing import TYPE_CHECKING, List, Dict, Any, Optional, Tuple, TextIO
 import re
+import hashlib
+import pickle
+import asyncio
+from urllib.parse import urlparse, parse_qsl, urlencode
+
+# anthropic, aiohttp, feedparser and dateutil are imported where they are
+# first needed to keep start-up fast
+if TYPE_CHECKING:
+    import aiohttp
 
 # Load environment variables
 load_dotenv()
 
+MODEL = "claude-3-7-sonnet-latest"
+MAX_TOKENS = 4000
+TEMPERATURE = 0.7
+
+_HTML_TAG = re.compile(r'<[^>\x1f]+>')
+# Raw summaries are cut to this length before HTML stripping; only the
+# first 500 characters of the stripped text are sent to Claude
+MAX_RAW_SUMMARY_CHARS = 4000
+# ASCII unit separator, used to strip HTML from all summaries in one pass
+_FIELD_SEP = '\x1f'
+_TITLE_SUFFIX = re.compile(r'\s*\|([^|]*)$')
+_WORD = re.compile(r'\w+')
+_NON_WORD = re.compile(r'\W+')
+
+# Query parameters that only track the referrer and don't identify the article
+TRACKING_PARAMS = {'ref', 'ref_src', 'fbclid', 'gclid', 'mc_cid', 'mc_eid'}
+
+# Titles whose word sets overlap more than this are treated as the same story
+DUPLICATE_TITLE_SIMILARITY = 0.8
+
+SYSTEM_PROMPT = "You are an expert podcast producer who creates concise, informative program notes."
+
+# Static part of the prompt, kept identical across runs so it can be served
+# from Anthropic's prompt cache. Per-run parameters and articles go after it.
+PROGRAM_NOTES_INSTRUCTIONS = """
+Based on the articles provided, create program notes for a weekly podcast episode.
+
+For each topic:
+1. Create a catchy title
+2. Write a brief summary (2-3 sentences)
+3. Include key points for discussion (3-5 bullet points)
+4. Mention relevant articles from the list (include the source name)
+
+Format the response as:
+# Weekly Podcast Program Notes
+
+## Topic 1: [Catchy Title]
+[Brief summary]
+
+Key points:
+- [Point 1]
+- [Point 2]
+- [Point 3]
+
+Related articles: [Article url] 
+
+## Topic 2: [Catchy Title]
+...and so on
+"""
+
 class RSSPodcastNoteGenerator:
     def __init__(self):
         # Get API key from environment variables
@@ -22,6 +78,7 @@ class RSSPodcastNoteGenerator:
             sys.exit(1)
             
         # Initialize Anthropic client
+        import anthropic
         self.client = anthropic.Anthropic(api_key=self.api_key)
         
         # Load RSS feeds from JSON file
@@ -35,10 +92,20 @@ class RSSPodcastNoteGenerator:
                 "Bitcoin Magazine": "https://bitcoinmagazine.com/.rss/full/"
             }
             
+        # Maximum number of simultaneous HTTP connections when fetching feeds
+        self.max_connections = int(os.getenv("RSS_MAX_CONNECTIONS", "20"))
+            
         # Create output directory if it doesn't exist
         self.output_dir = "output"
         if not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
+            
+        # Cache of generated program notes, keyed on the full rendered prompt
+        self.cache_dir = os.path.join(self.output_dir, ".cache")
+        self.cache_ttl_seconds = int(os.getenv("CACHE_TTL_SECONDS", str(24 * 60 * 60)))
+        
+        # Parsed feed entries with their ETag/Last-Modified validators
+        self.feed_cache_dir = os.path.join(self.output_dir, ".feedcache")
 
     def load_rss_feeds(self, json_file_path: str) -> Dict[str, str]:
         """Load RSS feeds from JSON file."""
@@ -53,57 +120,249 @@ class RSSPodcastNoteGenerator:
             print(f"Error loading RSS feeds from {json_file_path}: {e}")
             return {}
 
-    def fetch_rss_feed(self, url: str) -> List[Dict[str, Any]]:
-        """Fetch and parse an RSS feed."""
+    def _feed_cache_path(self, url: str) -> str:
+        """Return the parsed feed cache file path for a feed URL."""
+        return os.path.join(self.feed_cache_dir, f"{hashlib.sha256(url.encode('utf-8')).hexdigest()}.pkl")
+
+    def load_feed_cache(self, url: str) -> Optional[Tuple[str, str, List[Dict[str, Any]]]]:
+        """Return the cached (etag, last_modified, entries) of a feed, if any."""
         try:
-            feed = feedparser.parse(url)
-            return feed.entries
+            with open(self._feed_cache_path(url), 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return None
+
+    def save_feed_cache(self, url: str, etag: str, last_modified: str, entries: List[Dict[str, Any]], logs: List[str]) -> None:
+        """Atomically store the parsed entries of a feed with its validators."""
+        cache_path = self._feed_cache_path(url)
+        tmp_path = f"{cache_path}.tmp"
+        try:
+            os.makedirs(self.feed_cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                pickle.dump((etag, last_modified, entries), f)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            logs.append(f"Warning: could not cache RSS feed from {url}: {e}")
+
+    async def _fetch_bytes(self, session: 'aiohttp.ClientSession', url: str, etag: str, last_modified: str) -> Tuple[int, Optional[bytes], str, str]:
+        """Download a feed with a conditional GET.
+
+        Returns the HTTP status (0 on error), the body (None unless 200) and
+        the ETag/Last-Modified validators sent by the server.
+        """
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        
+        try:
+            async with session.get(url, headers=headers) as response:
+                if response.status == 304:
+                    return 304, None, etag, last_modified
+                response.raise_for_status()
+                body = await response.read()
+                return response.status, body, response.headers.get('ETag', ''), response.headers.get('Last-Modified', '')
         except Exception as e:
             print(f"Error fetching RSS feed from {url}: {e}")
+            return 0, None, '', ''
+
+    async def _fetch_feed(self, session: 'aiohttp.ClientSession', feed_name: str, feed_url: str, weeks_ago: int) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Fetch one feed and return its recent entries with log lines.
+
+        Loading the cache, parsing and filtering run in the default thread
+        pool so they overlap with other feeds' downloads.
+        """
+        loop = asyncio.get_running_loop()
+        cache = await loop.run_in_executor(None, self.load_feed_cache, feed_url)
+        etag, last_modified, cached_entries = cache if cache else ('', '', [])
+        
+        status, data, etag, last_modified = await self._fetch_bytes(session, feed_url, etag, last_modified)
+        return await loop.run_in_executor(
+            None, self._process_feed, feed_name, feed_url, status, data, etag, last_modified, cached_entries, weeks_ago
+        )
+
+    def _process_feed(self, feed_name: str, feed_url: str, status: int, data: Optional[bytes], etag: str, last_modified: str,
+                      cached_entries: List[Dict[str, Any]], weeks_ago: int) -> Tuple[List[Dict[str, Any]], List[str]]:
+        """Parse and cache a downloaded feed, or reuse its cached entries, then filter them.
+
+        Runs on a worker thread, so log lines are returned to the caller
+        instead of being printed directly.
+        """
+        logs = []
+        if data:
+            entries = self.parse_rss_feed(feed_url, data, logs)
+            self.save_feed_cache(feed_url, etag, last_modified, entries, logs)
+        else:
+            # Unchanged since the last run, or the download failed: skip parsing entirely
+            if status == 0 and cached_entries:
+                logs.append(f"Warning: could not download {feed_name}, using cached copy.")
+            entries = cached_entries
+        filtered_entries = self.tag_and_filter_entries(feed_name, entries, weeks_ago, logs)
+        return filtered_entries, logs
+
+    async def _fetch_all(self, selected_feeds: List[Tuple[str, str]], weeks_ago: int) -> List[Tuple[List[Dict[str, Any]], List[str]]]:
+        """Fetch all feeds concurrently on a single event loop."""
+        import aiohttp
+        import feedparser
+        
+        connector = aiohttp.TCPConnector(limit=self.max_connections)
+        timeout = aiohttp.ClientTimeout(total=15)
+        headers = {'User-Agent': feedparser.USER_AGENT}
+        async with aiohttp.ClientSession(connector=connector, timeout=timeout, headers=headers) as session:
+            return await asyncio.gather(*[
+                self._fetch_feed(session, feed_name, feed_url, weeks_ago)
+                for feed_name, feed_url in selected_feeds
+            ])
+
+    def parse_rss_feed(self, url: str, data: bytes, logs: List[str]) -> List[Dict[str, Any]]:
+        """Parse a downloaded RSS feed."""
+        import feedparser
+        
+        try:
+            feed = feedparser.parse(data, response_headers={'content-location': url})
+            return feed.entries
+        except Exception as e:
+            logs.append(f"Error parsing RSS feed from {url}: {e}")
             return []
 
-    def filter_entries_by_date(self, entries: List[Dict[str, Any]], weeks_ago: int) -> List[Dict[str, Any]]:
-        """Filter entries based on publication date."""
+    def tag_and_filter_entries(self, feed_name: str, entries: List[Dict[str, Any]], weeks_ago: int, logs: List[str]) -> List[Dict[str, Any]]:
+        """Tag a feed's entries with the source name and filter them by date."""
+        if not entries:
+            logs.append(f"No entries found in {feed_name}.")
+            return []
+        
+        # Add source information to each entry
+        for entry in entries:
+            entry['source_name'] = feed_name
+        
+        filtered_entries = self.filter_entries_by_date(entries, weeks_ago, logs)
+        logs.append(f"Found {len(filtered_entries)} entries from {feed_name} for the past {weeks_ago} week(s).")
+        return filtered_entries
+
+    def fetch_feeds(self, selected_feeds: List[Tuple[str, str]], weeks_ago: int) -> List[Dict[str, Any]]:
+        """Fetch the selected feeds concurrently and return their recent entries."""
+        results = asyncio.run(self._fetch_all(selected_feeds, weeks_ago))
+        
+        all_entries = []
+        for filtered_entries, logs in results:
+            for line in logs:
+                print(line)
+            all_entries.extend(filtered_entries)
+        
+        return all_entries
+
+    def filter_entries_by_date(self, entries: List[Dict[str, Any]], weeks_ago: int, logs: List[str]) -> List[Dict[str, Any]]:
+        """Filter entries based on publication date.
+
+        Dates are compared as UTC epoch seconds; feedparser's *_parsed
+        struct_time fields are converted with calendar.timegm, and only
+        entries without them go through dateutil.
+        """
         now = datetime.datetime.now(datetime.timezone.utc)
-        cutoff_date = now - datetime.timedelta(weeks=weeks_ago)
+        cutoff_ts = (now - datetime.timedelta(weeks=weeks_ago)).timestamp()
         
         filtered_entries = []
         for entry in entries:
             # Try to parse the published date
             try:
                 if 'published_parsed' in entry and entry.published_parsed:
-                    pub_date = datetime.datetime(*entry.published_parsed[:6], tzinfo=datetime.timezone.utc)
+                    pub_ts = calendar.timegm(entry.published_parsed)
                 elif 'published' in entry:
-                    pub_date = parser.parse(entry.published)
+                    pub_ts = self._parse_timestamp(entry.published)
                 elif 'updated_parsed' in entry and entry.updated_parsed:
-                    pub_date = datetime.datetime(*entry.updated_parsed[:6], tzinfo=datetime.timezone.utc)
+                    pub_ts = calendar.timegm(entry.updated_parsed)
                 elif 'updated' in entry:
-                    pub_date = parser.parse(entry.updated)
+                    pub_ts = self._parse_timestamp(entry.updated)
                 else:
                     # Skip entries without dates
                     continue
                 
-                if pub_date >= cutoff_date:
-                    # Add source information to the entry
+                if pub_ts >= cutoff_ts:
+                    # Keep the timestamp so later sorting doesn't re-parse the date
+                    entry['_pub_ts'] = pub_ts
                     filtered_entries.append(entry)
             except Exception as e:
-                print(f"Error parsing date for entry: {e}")
+                logs.append(f"Error parsing date for entry: {e}")
                 continue
                 
         return filtered_entries
 
-    def generate_program_notes(self, entries: List[Dict[str, Any]], num_topics: int, tech_level: int) -> str:
-        """Generate podcast program notes using Anthropic's Claude."""
-        if not entries:
-            return "No entries found for the selected time period."
+    def _parse_timestamp(self, date_string: str) -> float:
+        """Parse a date string into UTC epoch seconds, assuming UTC if no timezone is given."""
+        from dateutil import parser
         
-        # Prepare content for Claude
-        content = "Here are recent articles from RSS feeds:\n\n"
+        pub_date = parser.parse(date_string)
+        if pub_date.tzinfo is None:
+            pub_date = pub_date.replace(tzinfo=datetime.timezone.utc)
+        return pub_date.timestamp()
+
+    def deduplicate_entries(self, entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop entries whose link or title duplicates an earlier entry.
+
+        Links are compared without fragment or tracking parameters (utm_*,
+        ref, ...), keeping the rest of the query string. Titles are
+        compared after lowercasing and removing a trailing "| Source" (only
+        when it names a configured feed or the link's host), and are also
+        considered duplicates when their word sets are nearly equal.
+        """
+        source_keys = {_NON_WORD.sub('', name.lower()) for name in self.rss_feeds}
+        source_keys.discard('')
+        seen_links = set()
+        seen_titles = set()
+        seen_words = []
+        unique_entries = []
+        
+        for entry in entries:
+            link = urlparse(entry.get('link', ''))
+            query = urlencode(sorted(
+                (key, value) for key, value in parse_qsl(link.query, keep_blank_values=True)
+                if not key.lower().startswith('utm_') and key.lower() not in TRACKING_PARAMS
+            ))
+            link_key = f"{link.netloc.lower()}{link.path.rstrip('/')}"
+            if query:
+                link_key = f"{link_key}?{query}"
+            if link_key and link_key in seen_links:
+                continue
+            
+            title = entry.get('title', '').lower()
+            suffix = _TITLE_SUFFIX.search(title)
+            if suffix:
+                suffix_key = _NON_WORD.sub('', suffix.group(1))
+                host_key = _NON_WORD.sub('', link.netloc.lower())
+                if suffix_key and (suffix_key in source_keys or suffix_key in host_key):
+                    title = title[:suffix.start()]
+            title = " ".join(title.split())
+            words = frozenset(_WORD.findall(title))
+            if title and title in seen_titles:
+                continue
+            if words and any(
+                len(words & other) / len(words | other) > DUPLICATE_TITLE_SIMILARITY
+                for other in seen_words
+            ):
+                continue
+            
+            if link_key:
+                seen_links.add(link_key)
+            if title:
+                seen_titles.add(title)
+            if words:
+                seen_words.append(words)
+            unique_entries.append(entry)
+        
+        return unique_entries
+
+    def _to_columns(self, entries: List[Dict[str, Any]], limit: int = 20) -> Dict[str, List[str]]:
+        """Extract the prompt fields of the first `limit` entries into parallel lists.
+
+        Summaries are stripped of HTML in a single pass over all of them.
+        """
+        columns = {'title': [], 'link': [], 'summary': [], 'published': [], 'source': []}
         
-        for i, entry in enumerate(entries[:20]):  # Limit to 20 entries to avoid token limits
-            title = entry.get('title', 'No title')
-            link = entry.get('link', 'No link')
-            source = entry.get('source_name', 'Unknown source')
+        for entry in entries[:limit]:
+            columns['title'].append(entry.get('title', 'No title'))
+            columns['link'].append(entry.get('link', 'No link'))
+            columns['source'].append(entry.get('source_name', 'Unknown source'))
             
             # Try to get summary or content
             summary = ""
@@ -114,71 +373,121 @@ class RSSPodcastNoteGenerator:
                     if 'value' in content_item:
                         summary = content_item.value
                         break
-            
-            # Clean HTML tags from summary
-            summary = re.sub(r'<[^>]+>', '', summary)
+            columns['summary'].append(self._truncate_html(summary).replace(_FIELD_SEP, ' '))
             
             # Get published date
-            published = ""
-            if 'published' in entry:
-                published = entry.get('published', '')
-            elif 'updated' in entry:
-                published = entry.get('updated', '')
-            
-            content += f"Article {i+1}:\n"
-            content += f"Title: {title}\n"
-            content += f"Source: {source}\n"
-            content += f"Link: {link}\n"
-            content += f"Published: {published}\n"
-            content += f"Summary: {summary[:500]}...\n\n"  # Limit summary length
-        
-        # Create prompt for Claude
-        prompt = f"""
-Based on the articles provided, create program notes for a weekly podcast episode.
-The notes should cover {num_topics} main topics from these articles.
+            columns['published'].append(entry.get('published', entry.get('updated', '')))
+        
+        # Clean HTML tags from all summaries at once
+        if columns['summary']:
+            columns['summary'] = _HTML_TAG.sub('', _FIELD_SEP.join(columns['summary'])).split(_FIELD_SEP)
+        
+        return columns
 
-Technical depth level: {tech_level}/5 (where 0 is non-technical and 5 is highly technical)
+    def _truncate_html(self, html: str) -> str:
+        """Cut raw HTML to MAX_RAW_SUMMARY_CHARS, dropping a tag split by the cut."""
+        if len(html) <= MAX_RAW_SUMMARY_CHARS:
+            return html
+        html = html[:MAX_RAW_SUMMARY_CHARS]
+        tag_start = html.rfind('<')
+        if tag_start > html.rfind('>'):
+            html = html[:tag_start]
+        return html
 
-For each topic:
-1. Create a catchy title
-2. Write a brief summary (2-3 sentences)
-3. Include key points for discussion (3-5 bullet points)
-4. Mention relevant articles from the list (include the source name)
+    def _cache_path(self, prompt: str) -> str:
+        """Return the response cache file path for a rendered prompt."""
+        key_source = "\x00".join([MODEL, str(MAX_TOKENS), str(TEMPERATURE), SYSTEM_PROMPT, PROGRAM_NOTES_INSTRUCTIONS, prompt])
+        key = hashlib.sha256(key_source.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.md")
 
-Here are the articles:
-{content}
+    def _is_cache_fresh(self, cache_path: str) -> bool:
+        """Check whether a cached response exists and is within the TTL."""
+        try:
+            age = datetime.datetime.now().timestamp() - os.path.getmtime(cache_path)
+        except OSError:
+            return False
+        return age <= self.cache_ttl_seconds
 
-Format the response as:
-# Weekly Podcast Program Notes
+    def generate_program_notes(self, entries: List[Dict[str, Any]], num_topics: int, tech_level: int, out: TextIO) -> bool:
+        """Generate podcast program notes using Anthropic's Claude.
 
-## Topic 1: [Catchy Title]
-[Brief summary]
+        The notes are streamed to stdout and to `out` as they are generated.
+        Returns True if the notes were generated successfully.
+        """
+        def emit(text: str) -> None:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+            out.write(text)
 
-Key points:
-- [Point 1]
-- [Point 2]
-- [Point 3]
+        if not entries:
+            emit("No entries found for the selected time period.")
+            return False
+        
+        # Prepare content for Claude
+        columns = self._to_columns(entries)
+        articles = zip(columns['title'], columns['source'], columns['link'], columns['published'], columns['summary'])
+        content = "Here are recent articles from RSS feeds:\n\n" + "".join(
+            f"Article {i+1}:\n"
+            f"Title: {title}\n"
+            f"Source: {source}\n"
+            f"Link: {link}\n"
+            f"Published: {published}\n"
+            f"Summary: {summary[:500]}...\n\n"  # Limit summary length
+            for i, (title, source, link, published, summary) in enumerate(articles)
+        )
+        
+        # Create the per-run part of the prompt for Claude
+        prompt = f"""
+The notes should cover {num_topics} main topics from these articles.
 
-Related articles: [Article url] 
+Technical depth level: {tech_level}/5 (where 0 is non-technical and 5 is highly technical)
 
-## Topic 2: [Catchy Title]
-...and so on
+Here are the articles:
+{content}
 """
 
+        cache_path = self._cache_path(prompt)
+        if self._is_cache_fresh(cache_path):
+            print("Using cached program notes.\n")
+            with open(cache_path, "r", encoding="utf-8") as f:
+                for chunk in iter(lambda: f.read(8192), ""):
+                    emit(chunk)
+            return True
+
+        # Stream into a temporary cache file, published only once complete
+        tmp_path = f"{cache_path}.tmp"
         try:
-            response = self.client.messages.create(
-                model="claude-3-7-sonnet-latest",
-                max_tokens=4000,
-                temperature=0.7,
-                system="You are an expert podcast producer who creates concise, informative program notes.",
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as cache_file, self.client.messages.stream(
+                model=MODEL,
+                max_tokens=MAX_TOKENS,
+                temperature=TEMPERATURE,
+                system=[
+                    {"type": "text", "text": SYSTEM_PROMPT, "cache_control": {"type": "ephemeral"}}
+                ],
                 messages=[
-                    {"role": "user", "content": prompt}
+                    {
+                        "role": "user",
+                        "content": [
+                            # Static instructions are cached; the articles stay outside the cache boundary
+                            {"type": "text", "text": PROGRAM_NOTES_INSTRUCTIONS, "cache_control": {"type": "ephemeral"}},
+                            {"type": "text", "text": prompt},
+                        ],
+                    }
                 ]
-            )
-            return response.content[0].text
+            ) as stream:
+                for text in stream.text_stream:
+                    emit(text)
+                    cache_file.write(text)
+            os.replace(tmp_path, cache_path)
+            return True
         except Exception as e:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            emit("\n")
             print(f"Error generating program notes: {e}")
-            return "Failed to generate program notes. Please try again."
+            emit("Failed to generate program notes. Please try again.")
+            return False
 
     def sort_feeds(self, feeds: Dict[str, str], sort_option: int) -> List[Tuple[str, str]]:
         """Sort feeds based on user selection."""
@@ -191,6 +500,17 @@ Related articles: [Article url]
         else:
             return feed_items  # Default order (as in JSON)
 
+    def _prompt_int(self, prompt: str, lo: int, hi: int) -> int:
+        """Prompt until the user enters an integer between lo and hi (inclusive)."""
+        while True:
+            try:
+                value = int(input(prompt))
+                if lo <= value <= hi:
+                    return value
+                print(f"Please enter a number between {lo} and {hi}.")
+            except ValueError:
+                print("Please enter a number.")
+
     def run(self):
         """Main execution flow."""
         # Sort feeds
@@ -199,15 +519,7 @@ Related articles: [Article url]
         print("2. Alphabetical (Z-A)")
         print("3. Default order (as in JSON)")
         
-        while True:
-            try:
-                sort_option = int(input("\nSelect sorting option (number): "))
-                if 1 <= sort_option <= 3:
-                    break
-                else:
-                    print("Invalid selection. Please try again.")
-            except ValueError:
-                print("Please enter a number.")
+        sort_option = self._prompt_int("\nSelect sorting option (number): ", 1, 3)
         
         sorted_feeds = self.sort_feeds(self.rss_feeds, sort_option)
         
@@ -246,71 +558,29 @@ Related articles: [Article url]
         print("3. Past 3 weeks")
         print("4. Past 4 weeks")
         
-        while True:
-            try:
-                weeks_choice = int(input("\nSelect time period (number): "))
-                if 1 <= weeks_choice <= 4:
-                    weeks_ago = weeks_choice
-                    break
-                else:
-                    print("Invalid selection. Please try again.")
-            except ValueError:
-                print("Please enter a number.")
+        weeks_ago = self._prompt_int("\nSelect time period (number): ", 1, 4)
         
         # Fetch and combine entries from all selected feeds
-        all_entries = []
-        for feed_name, feed_url in selected_feeds:
-            print(f"\nFetching {feed_name} feed...")
-            entries = self.fetch_rss_feed(feed_url)
-            
-            if entries:
-                # Add source information to each entry
-                for entry in entries:
-                    entry['source_name'] = feed_name
-                
-                filtered_entries = self.filter_entries_by_date(entries, weeks_ago)
-                print(f"Found {len(filtered_entries)} entries from {feed_name} for the past {weeks_ago} week(s).")
-                all_entries.extend(filtered_entries)
-            else:
-                print(f"No entries found in {feed_name}.")
+        print(f"\nFetching {len(selected_feeds)} feed(s)...")
+        all_entries = self.fetch_feeds(selected_feeds, weeks_ago)
         
         if not all_entries:
             print("No entries found for the selected time period and feeds. Exiting.")
             return
             
         # Sort combined entries by date (newest first)
-        all_entries.sort(key=lambda entry: parser.parse(entry.get('published', entry.get('updated', '1970-01-01'))), reverse=True)
+        all_entries.sort(key=lambda entry: entry['_pub_ts'], reverse=True)
+        
+        # Drop stories syndicated across several feeds, keeping the newest copy
+        all_entries = self.deduplicate_entries(all_entries)
         
         print(f"\nTotal entries from all selected feeds: {len(all_entries)}")
         
         # Get number of topics
-        while True:
-            try:
-                num_topics = int(input("\nHow many topics for the program notes? (1-5): "))
-                if 1 <= num_topics <= 5:
-                    break
-                else:
-                    print("Please enter a number between 1 and 5.")
-            except ValueError:
-                print("Please enter a number.")
+        num_topics = self._prompt_int("\nHow many topics for the program notes? (1-5): ", 1, 5)
         
         # Get technical level
-        while True:
-            try:
-                tech_level = int(input("\nTechnical depth level (0-5, where 0 is non-technical and 5 is highly technical): "))
-                if 0 <= tech_level <= 5:
-                    break
-                else:
-                    print("Please enter a number between 0 and 5.")
-            except ValueError:
-                print("Please enter a number.")
-        
-        print("\nGenerating podcast program notes...")
-        program_notes = self.generate_program_notes(all_entries, num_topics, tech_level)
-        
-        # Display and save results
-        print("\n=== Podcast Program Notes ===\n")
-        print(program_notes)
+        tech_level = self._prompt_int("\nTechnical depth level (0-5, where 0 is non-technical and 5 is highly technical): ", 0, 5)
         
         # Create a descriptive filename
         timestamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
@@ -318,10 +588,20 @@ Related articles: [Article url]
         filename = f"{timestamp}_podcast_notes.md"
         filepath = os.path.join(self.output_dir, filename)
         
+        print("\nGenerating podcast program notes...")
+        print("\n=== Podcast Program Notes ===\n")
+        
+        # Display and save results as they are generated
         with open(filepath, "w", encoding="utf-8") as f:
-            f.write(program_notes)
+            success = self.generate_program_notes(all_entries, num_topics, tech_level, f)
+        
+        if not success:
+            # Don't leave partially generated notes behind
+            os.remove(filepath)
+            print("\n\nProgram notes were not saved.")
+            return
         
-        print(f"\nProgram notes saved to {filepath}")
+        print(f"\n\nProgram notes saved to {filepath}")
 
 if __name__ == "__main__":
     print("=== RSS Podcast Note Generator ===")